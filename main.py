@@ -1,13 +1,15 @@
-import re
+import heapq
 from datetime import datetime
-from collections import defaultdict
 import os
+import sys
 
 from utils.file_handler import (
-    read_sales_data,
+    ID_PREFIXES,
+    iter_sales_data,
     parse_transactions,
 )
 from utils.data_processor import (
+    aggregate_all,
     calculate_total_revenue,
     region_wise_sales,
     top_selling_products,
@@ -22,10 +24,22 @@ from utils.api_handler import (
     enrich_sales_data,
 )
 
-def clean_sales_data(file_path):
-    total_records = 0
-    invalid_records = 0
-    valid_records = []
+# Fields a transaction must carry to be validated
+REQUIRED_KEYS = frozenset({
+    "TransactionID", "ProductID", "CustomerID",
+    "Quantity", "UnitPrice", "Region",
+})
+
+def iter_clean_sales_data(file_path, stats=None):
+    """
+    Streams cleaned, valid records from the sales file one at a time
+    Running counts are kept in stats (total_records, invalid_records)
+    so callers can fold records into aggregates without holding them all
+    """
+    if stats is None:
+        stats = {}
+    stats["total_records"] = 0
+    stats["invalid_records"] = 0
 
     with open(file_path, "r", encoding="latin-1") as file:
         header = file.readline().strip().split("|")
@@ -37,13 +51,13 @@ def clean_sales_data(file_path):
             if not line:
                 continue
 
-            total_records += 1
+            stats["total_records"] += 1
 
             parts = line.split("|")
 
             # Skip rows with missing or extra fields
             if len(parts) != len(header):
-                invalid_records += 1
+                stats["invalid_records"] += 1
                 continue
 
             record = dict(zip(header, parts))
@@ -54,12 +68,13 @@ def clean_sales_data(file_path):
                 customer_id = record["CustomerID"].strip()
                 region = record["Region"].strip()
 
-                if not transaction_id.startswith("T"):
-                    invalid_records += 1
+                # Index the first character instead of calling startswith()
+                if not transaction_id or transaction_id[0] != "T":
+                    stats["invalid_records"] += 1
                     continue
 
                 if customer_id == "" or region == "":
-                    invalid_records += 1
+                    stats["invalid_records"] += 1
                     continue
 
                 # ---------------- CLEANING ----------------
@@ -69,33 +84,43 @@ def clean_sales_data(file_path):
                 # Clean Quantity
                 quantity = int(record["Quantity"])
                 if quantity <= 0:
-                    invalid_records += 1
+                    stats["invalid_records"] += 1
                     continue
                 record["Quantity"] = quantity
 
                 # Clean UnitPrice (remove commas)
                 unit_price = float(record["UnitPrice"].replace(",", ""))
                 if unit_price <= 0:
-                    invalid_records += 1
+                    stats["invalid_records"] += 1
                     continue
                 record["UnitPrice"] = unit_price
-
-                valid_records.append(record)
+                record["Revenue"] = quantity * unit_price
 
             except Exception:
-                invalid_records += 1
+                stats["invalid_records"] += 1
+                continue
+
+            yield record
+
+
+def clean_sales_data(file_path):
+    stats = {}
+    valid_records = list(iter_clean_sales_data(file_path, stats))
 
     # ---------------- OUTPUT ----------------
-    print(f"Total records parsed: {total_records}")
-    print(f"Invalid records removed: {invalid_records}")
+    print(f"Total records parsed: {stats['total_records']}")
+    print(f"Invalid records removed: {stats['invalid_records']}")
     print(f"Valid records after cleaning: {len(valid_records)}")
 
     return valid_records
 
 
-def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
+def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt',
+                          aggregates=None, api_matches=None):
     """
     Generates a comprehensive formatted text report
+    Pass the API_Match flags already built by the caller as api_matches
+    to reuse them instead of rebuilding the mask
     """
 
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
@@ -103,159 +128,159 @@ def generate_sales_report(transactions, enriched_transactions, output_file='outp
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     total_records = len(transactions)
 
+    # ---------------- SINGLE-PASS AGGREGATION ----------------
+    if aggregates is None:
+        aggregates = aggregate_all(transactions)
+
+    total_revenue = aggregates["total_revenue"]
+    region_data = aggregates["region"]
+    product_data = aggregates["product"]
+    customer_data = aggregates["customer"]
+    daily_data = aggregates["daily"]
+
     # ---------------- OVERALL SUMMARY ----------------
-    total_revenue = sum(tx["Quantity"] * tx["UnitPrice"] for tx in transactions)
     avg_order_value = total_revenue / total_records if total_records else 0
 
-    dates = sorted(tx["Date"] for tx in transactions)
-    date_range = f"{dates[0]} to {dates[-1]}" if dates else "N/A"
+    daily_rows = sorted(daily_data.items())
+    date_range = f"{daily_rows[0][0]} to {daily_rows[-1][0]}" if daily_rows else "N/A"
 
     # ---------------- REGION-WISE PERFORMANCE ----------------
-    region_data = defaultdict(lambda: {"revenue": 0.0, "count": 0})
-
-    for tx in transactions:
-        revenue = tx["Quantity"] * tx["UnitPrice"]
-        region_data[tx["Region"]]["revenue"] += revenue
-        region_data[tx["Region"]]["count"] += 1
-
     region_rows = []
     for region, data in region_data.items():
-        percentage = (data["revenue"] / total_revenue) * 100 if total_revenue else 0
-        region_rows.append((region, data["revenue"], percentage, data["count"]))
+        percentage = (data["total_sales"] / total_revenue) * 100 if total_revenue else 0
+        region_rows.append((region, data["total_sales"], percentage, data["transaction_count"]))
 
     region_rows.sort(key=lambda x: x[1], reverse=True)
 
     # ---------------- TOP 5 PRODUCTS ----------------
-    product_data = defaultdict(lambda: {"qty": 0, "revenue": 0.0})
-
-    for tx in transactions:
-        product_data[tx["ProductName"]]["qty"] += tx["Quantity"]
-        product_data[tx["ProductName"]]["revenue"] += tx["Quantity"] * tx["UnitPrice"]
-
-    top_products = sorted(
+    top_products = heapq.nlargest(
+        5,
         product_data.items(),
-        key=lambda x: x[1]["qty"],
-        reverse=True
-    )[:5]
+        key=lambda x: x[1]["quantity"],
+    )
 
     # ---------------- TOP 5 CUSTOMERS ----------------
-    customer_data = defaultdict(lambda: {"spent": 0.0, "count": 0})
-
-    for tx in transactions:
-        customer_data[tx["CustomerID"]]["spent"] += tx["Quantity"] * tx["UnitPrice"]
-        customer_data[tx["CustomerID"]]["count"] += 1
-
-    top_customers = sorted(
+    top_customers = heapq.nlargest(
+        5,
         customer_data.items(),
-        key=lambda x: x[1]["spent"],
-        reverse=True
-    )[:5]
-
-    # ---------------- DAILY SALES TREND ----------------
-    daily_data = defaultdict(lambda: {"revenue": 0.0, "count": 0, "customers": set()})
-
-    for tx in transactions:
-        daily_data[tx["Date"]]["revenue"] += tx["Quantity"] * tx["UnitPrice"]
-        daily_data[tx["Date"]]["count"] += 1
-        daily_data[tx["Date"]]["customers"].add(tx["CustomerID"])
-
-    daily_rows = sorted(daily_data.items())
+        key=lambda x: x[1]["total_spent"],
+    )
 
     # ---------------- PRODUCT PERFORMANCE ----------------
     best_day = max(daily_rows, key=lambda x: x[1]["revenue"])
 
     low_products = [
-        (p, d["qty"], d["revenue"])
+        (p, d["quantity"], d["revenue"])
         for p, d in product_data.items()
-        if d["qty"] < 10
+        if d["quantity"] < 10
     ]
 
     avg_tx_value_region = {
-        r: d["revenue"] / d["count"]
+        r: d["total_sales"] / d["transaction_count"]
         for r, d in region_data.items()
     }
 
     # ---------------- API ENRICHMENT SUMMARY ----------------
-    enriched_count = sum(1 for tx in enriched_transactions if tx.get("API_Match"))
+    # Build the API_Match mask once and reuse it for both stats
+    if api_matches is None:
+        api_matches = [bool(tx.get("API_Match")) for tx in enriched_transactions]
+
+    enriched_count = sum(api_matches)
     enrichment_rate = (enriched_count / len(enriched_transactions)) * 100 if enriched_transactions else 0
 
     unenriched_products = sorted({
         tx["ProductName"]
-        for tx in enriched_transactions
-        if not tx.get("API_Match")
+        for tx, matched in zip(enriched_transactions, api_matches)
+        if not matched
     })
 
     # ---------------- WRITE REPORT ----------------
+    # Build the report in memory and emit it with a single write()
+    parts = []
+    parts.append("=" * 44 + "\n")
+    parts.append("           SALES ANALYTICS REPORT\n")
+    parts.append(f"         Generated: {now}\n")
+    parts.append(f"         Records Processed: {total_records}\n")
+    parts.append("=" * 44 + "\n\n")
+
+    parts.append("OVERALL SUMMARY\n")
+    parts.append("-" * 44 + "\n")
+    parts.append(f"Total Revenue:        ₹{total_revenue:,.2f}\n")
+    parts.append(f"Total Transactions:   {total_records}\n")
+    parts.append(f"Average Order Value:  ₹{avg_order_value:,.2f}\n")
+    parts.append(f"Date Range:           {date_range}\n\n")
+
+    parts.append("REGION-WISE PERFORMANCE\n")
+    parts.append("-" * 44 + "\n")
+    parts.append(f"{'Region':10}{'Sales':15}{'% of Total':12}{'Transactions'}\n")
+    parts.extend(
+        f"{r:10}₹{rev:,.0f}{'':5}{pct:6.2f}%{'':6}{cnt}\n"
+        for r, rev, pct, cnt in region_rows
+    )
+    parts.append("\n")
+
+    parts.append("TOP 5 PRODUCTS\n")
+    parts.append("-" * 44 + "\n")
+    parts.append(f"{'Rank':5}{'Product':20}{'Qty':6}{'Revenue'}\n")
+    parts.extend(
+        f"{i:<5}{p:20}{d['quantity']:<6}₹{d['revenue']:,.2f}\n"
+        for i, (p, d) in enumerate(top_products, 1)
+    )
+    parts.append("\n")
+
+    parts.append("TOP 5 CUSTOMERS\n")
+    parts.append("-" * 44 + "\n")
+    parts.append(f"{'Rank':5}{'Customer':15}{'Spent':15}{'Orders'}\n")
+    parts.extend(
+        f"{i:<5}{c:15}₹{d['total_spent']:,.2f}{'':3}{d['purchase_count']}\n"
+        for i, (c, d) in enumerate(top_customers, 1)
+    )
+    parts.append("\n")
+
+    parts.append("DAILY SALES TREND\n")
+    parts.append("-" * 44 + "\n")
+    parts.append(f"{'Date':12}{'Revenue':15}{'Txns':8}{'Customers'}\n")
+    parts.extend(
+        f"{date:12}₹{d['revenue']:,.2f}{'':2}{d['transaction_count']:<8}{len(d['unique_customers'])}\n"
+        for date, d in daily_rows
+    )
+    parts.append("\n")
+
+    parts.append("PRODUCT PERFORMANCE ANALYSIS\n")
+    parts.append("-" * 44 + "\n")
+    parts.append(f"Best Selling Day: {best_day[0]} (₹{best_day[1]['revenue']:,.2f})\n\n")
+
+    if low_products:
+        parts.append("Low Performing Products:\n")
+        parts.extend(
+            f"- {p}: Qty={q}, Revenue=₹{r:,.2f}\n"
+            for p, q, r in low_products
+        )
+    else:
+        parts.append("No low performing products found.\n")
+
+    parts.append("\nAverage Transaction Value per Region:\n")
+    parts.extend(f"- {r}: ₹{v:,.2f}\n" for r, v in avg_tx_value_region.items())
+
+    parts.append("\nAPI ENRICHMENT SUMMARY\n")
+    parts.append("-" * 44 + "\n")
+    parts.append(f"Total Enriched Records: {enriched_count}\n")
+    parts.append(f"Success Rate: {enrichment_rate:.2f}%\n")
+    parts.append("Unenriched Products:\n")
+    parts.extend(f"- {p}\n" for p in unenriched_products)
+
     with open(output_file, "w", encoding="utf-8") as f:
-        f.write("=" * 44 + "\n")
-        f.write("           SALES ANALYTICS REPORT\n")
-        f.write(f"         Generated: {now}\n")
-        f.write(f"         Records Processed: {total_records}\n")
-        f.write("=" * 44 + "\n\n")
-
-        f.write("OVERALL SUMMARY\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"Total Revenue:        ₹{total_revenue:,.2f}\n")
-        f.write(f"Total Transactions:   {total_records}\n")
-        f.write(f"Average Order Value:  ₹{avg_order_value:,.2f}\n")
-        f.write(f"Date Range:           {date_range}\n\n")
-
-        f.write("REGION-WISE PERFORMANCE\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"{'Region':10}{'Sales':15}{'% of Total':12}{'Transactions'}\n")
-        for r, rev, pct, cnt in region_rows:
-            f.write(f"{r:10}₹{rev:,.0f}{'':5}{pct:6.2f}%{'':6}{cnt}\n")
-        f.write("\n")
-
-        f.write("TOP 5 PRODUCTS\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"{'Rank':5}{'Product':20}{'Qty':6}{'Revenue'}\n")
-        for i, (p, d) in enumerate(top_products, 1):
-            f.write(f"{i:<5}{p:20}{d['qty']:<6}₹{d['revenue']:,.2f}\n")
-        f.write("\n")
-
-        f.write("TOP 5 CUSTOMERS\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"{'Rank':5}{'Customer':15}{'Spent':15}{'Orders'}\n")
-        for i, (c, d) in enumerate(top_customers, 1):
-            f.write(f"{i:<5}{c:15}₹{d['spent']:,.2f}{'':3}{d['count']}\n")
-        f.write("\n")
-
-        f.write("DAILY SALES TREND\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"{'Date':12}{'Revenue':15}{'Txns':8}{'Customers'}\n")
-        for date, d in daily_rows:
-            f.write(f"{date:12}₹{d['revenue']:,.2f}{'':2}{d['count']:<8}{len(d['customers'])}\n")
-        f.write("\n")
-
-        f.write("PRODUCT PERFORMANCE ANALYSIS\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"Best Selling Day: {best_day[0]} (₹{best_day[1]['revenue']:,.2f})\n\n")
-
-        if low_products:
-            f.write("Low Performing Products:\n")
-            for p, q, r in low_products:
-                f.write(f"- {p}: Qty={q}, Revenue=₹{r:,.2f}\n")
-        else:
-            f.write("No low performing products found.\n")
-
-        f.write("\nAverage Transaction Value per Region:\n")
-        for r, v in avg_tx_value_region.items():
-            f.write(f"- {r}: ₹{v:,.2f}\n")
-
-        f.write("\nAPI ENRICHMENT SUMMARY\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"Total Enriched Records: {enriched_count}\n")
-        f.write(f"Success Rate: {enrichment_rate:.2f}%\n")
-        f.write("Unenriched Products:\n")
-        for p in unenriched_products:
-            f.write(f"- {p}\n")
+        f.write("".join(parts))
 
     print(f" Sales report generated at: {output_file}")
 
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, parse_stats=None, verbose=True):
     """
     Validates transactions and applies optional filters
+    Pass the stats filled by parse_transactions() as parse_stats to reuse
+    its regions and amount range instead of collecting them per row
+    With verbose=False nothing is printed and the available regions and
+    amount range are not computed; the returned filter_summary has the counts
 
     Returns:
     - valid_transactions: list
@@ -274,71 +299,109 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
         "final_count": 0,
     }
 
-    # Display available regions
-    available_regions = sorted({tx.get("Region") for tx in transactions if tx.get("Region")})
-    print(f"Available Regions: {', '.join(available_regions)}")
+    # Intern the filter value like parsed regions so the per-row
+    # comparison hits the identity fast path
+    if isinstance(region, str):
+        region = sys.intern(region)
 
-    # Display transaction amount range
-    amounts = [
-        tx["Quantity"] * tx["UnitPrice"]
-        for tx in transactions
-        if isinstance(tx.get("Quantity"), int) and isinstance(tx.get("UnitPrice"), (int, float))
-    ]
+    # Available regions and amount range are gathered in the main loop
+    # rather than with separate passes over the transactions, unless
+    # parse_transactions() already collected them
+    collect_diagnostics = verbose and parse_stats is None
+    regions_seen = set()
+    amount_min = None
+    amount_max = None
 
-    if amounts:
-        print(f"Transaction Amount Range: ₹{min(amounts):,.0f} - ₹{max(amounts):,.0f}")
+    filtered_by_region = 0
+    filtered_by_amount = 0
+
+    # Skip the per-row filter checks entirely when no filter is set
+    filters_enabled = bool(region) or min_amount is not None or max_amount is not None
+
+    tid_prefix, pid_prefix, cid_prefix = ID_PREFIXES
 
     for tx in transactions:
+        if collect_diagnostics:
+            tx_region = tx.get("Region")
+            if tx_region:
+                regions_seen.add(tx_region)
+
+            tx_quantity = tx.get("Quantity")
+            tx_unit_price = tx.get("UnitPrice")
+            if isinstance(tx_quantity, int) and isinstance(tx_unit_price, (int, float)):
+                tx_amount = tx_quantity * tx_unit_price
+                if amount_min is None or tx_amount < amount_min:
+                    amount_min = tx_amount
+                if amount_max is None or tx_amount > amount_max:
+                    amount_max = tx_amount
+
         try:
             # ---------------- VALIDATION RULES ----------------
-            if not all(k in tx for k in [
-                "TransactionID", "ProductID", "CustomerID",
-                "Quantity", "UnitPrice", "Region"
-            ]):
-                invalid_count += 1
-                continue
-
-            if not tx["TransactionID"].startswith("T"):
+            if not tx.keys() >= REQUIRED_KEYS:
                 invalid_count += 1
                 continue
 
-            if not tx["ProductID"].startswith("P"):
+            # Compare the cached one-character prefixes directly; the
+            # chain stops at the first mismatch without building a tuple
+            if (
+                tx["TransactionID"][:1] != tid_prefix
+                or tx["ProductID"][:1] != pid_prefix
+                or tx["CustomerID"][:1] != cid_prefix
+            ):
                 invalid_count += 1
                 continue
 
-            if not tx["CustomerID"].startswith("C"):
-                invalid_count += 1
-                continue
+            # Look up each numeric field once and reuse the amount below
+            quantity = tx["Quantity"]
+            unit_price = tx["UnitPrice"]
 
-            if tx["Quantity"] <= 0 or tx["UnitPrice"] <= 0:
+            if quantity <= 0 or unit_price <= 0:
                 invalid_count += 1
                 continue
 
             # ---------------- FILTERING ----------------
-            amount = tx["Quantity"] * tx["UnitPrice"]
+            amount = quantity * unit_price
 
-            if region and tx["Region"] != region:
-                filter_summary["filtered_by_region"] += 1
-                continue
+            if filters_enabled:
+                if region and tx["Region"] != region:
+                    filtered_by_region += 1
+                    continue
 
-            if min_amount is not None and amount < min_amount:
-                filter_summary["filtered_by_amount"] += 1
-                continue
+                if min_amount is not None and amount < min_amount:
+                    filtered_by_amount += 1
+                    continue
 
-            if max_amount is not None and amount > max_amount:
-                filter_summary["filtered_by_amount"] += 1
-                continue
+                if max_amount is not None and amount > max_amount:
+                    filtered_by_amount += 1
+                    continue
 
+            # Cache the line amount so downstream aggregations reuse it
+            tx["Revenue"] = amount
             valid_transactions.append(tx)
 
         except Exception:
             invalid_count += 1
 
     filter_summary["invalid"] = invalid_count
+    filter_summary["filtered_by_region"] = filtered_by_region
+    filter_summary["filtered_by_amount"] = filtered_by_amount
     filter_summary["final_count"] = len(valid_transactions)
 
-    print(f"Records after validation: {filter_summary['total_input'] - invalid_count}")
-    print(f"Final valid records: {filter_summary['final_count']}")
+    if verbose:
+        if parse_stats is not None:
+            regions_seen = {r for r in parse_stats["regions"] if r}
+            amount_min = parse_stats["amount_min"]
+            amount_max = parse_stats["amount_max"]
+
+        # Display available regions
+        print(f"Available Regions: {', '.join(sorted(regions_seen))}")
+
+        # Display transaction amount range
+        if amount_min is not None:
+            print(f"Transaction Amount Range: ₹{amount_min:,.0f} - ₹{amount_max:,.0f}")
+
+        print(f"Records after validation: {filter_summary['total_input'] - invalid_count}")
+        print(f"Final valid records: {filter_summary['final_count']}")
 
     return valid_transactions, invalid_count, filter_summary
 
@@ -354,22 +417,27 @@ def main():
         print()
 
         # 1. Read sales data
+        # Lines are streamed straight into the parser, so reading and
+        # parsing happen in the same pass without a raw_lines list
         print("[1/10] Reading sales data...")
-        raw_lines = read_sales_data("data/sales_data.txt")
-        print(f"✓ Successfully read {len(raw_lines)} transactions\n")
+        read_stats = {}
+        parse_stats = {}
+        transactions = parse_transactions(
+            iter_sales_data("data/sales_data.txt", read_stats), parse_stats
+        )
+        print(f"✓ Successfully read {read_stats['line_count']} transactions\n")
 
         # 2. Parse and clean
         print("[2/10] Parsing and cleaning data...")
-        transactions = parse_transactions(raw_lines)
         print(f"✓ Parsed {len(transactions)} records\n")
 
         # 3. Display filter options
-        regions = sorted({tx["Region"] for tx in transactions})
-        amounts = [tx["Quantity"] * tx["UnitPrice"] for tx in transactions]
+        # Regions and amount range were collected while parsing
+        regions = sorted(parse_stats["regions"])
 
         print("[3/10] Filter Options Available:")
         print(f"Regions: {', '.join(regions)}")
-        print(f"Amount Range: ₹{min(amounts):,.0f} - ₹{max(amounts):,.0f}\n")
+        print(f"Amount Range: ₹{parse_stats['amount_min']:,.0f} - ₹{parse_stats['amount_max']:,.0f}\n")
 
         apply_filter = input("Do you want to filter data? (y/n): ").strip().lower()
 
@@ -397,18 +465,20 @@ def main():
             region=region_filter,
             min_amount=min_amount,
             max_amount=max_amount,
+            parse_stats=parse_stats,
         )
         print(f"✓ Valid: {len(valid_transactions)} | Invalid: {invalid_count}\n")
 
         # 5. Analysis
         print("[5/10] Analyzing sales data...")
-        _ = calculate_total_revenue(valid_transactions)
-        _ = region_wise_sales(valid_transactions)
-        _ = top_selling_products(valid_transactions)
-        _ = customer_analysis(valid_transactions)
-        _ = daily_sales_trend(valid_transactions)
-        _ = find_peak_sales_day(valid_transactions)
-        _ = low_performing_products(valid_transactions)
+        aggregates = aggregate_all(valid_transactions)
+        _ = calculate_total_revenue(valid_transactions, aggregates=aggregates)
+        _ = region_wise_sales(valid_transactions, aggregates=aggregates)
+        _ = top_selling_products(valid_transactions, aggregates=aggregates)
+        _ = customer_analysis(valid_transactions, aggregates=aggregates)
+        _ = daily_sales_trend(valid_transactions, aggregates=aggregates)
+        _ = find_peak_sales_day(valid_transactions, aggregates=aggregates)
+        _ = low_performing_products(valid_transactions, aggregates=aggregates)
         print("✓ Analysis complete\n")
 
         # 6. Fetch API data
@@ -421,7 +491,9 @@ def main():
         product_mapping = create_product_mapping(api_products)
         enriched_transactions = enrich_sales_data(valid_transactions, product_mapping)
 
-        enriched_count = sum(1 for tx in enriched_transactions if tx["API_Match"])
+        # The same mask feeds the enrichment summary in the report
+        api_matches = [bool(tx.get("API_Match")) for tx in enriched_transactions]
+        enriched_count = sum(api_matches)
         success_rate = (enriched_count / len(enriched_transactions)) * 100 if enriched_transactions else 0
 
         print(f"✓ Enriched {enriched_count}/{len(enriched_transactions)} "
@@ -433,7 +505,12 @@ def main():
 
         # 9. Generate report
         print("[9/10] Generating report...")
-        generate_sales_report(valid_transactions, enriched_transactions)
+        generate_sales_report(
+            valid_transactions,
+            enriched_transactions,
+            aggregates=aggregates,
+            api_matches=api_matches,
+        )
         print("✓ Report saved to: output/sales_report.txt\n")
 
         # 10. Done
@@ -1,11 +1,30 @@
+import json
 import requests
 import os
+import time
 
 
-def fetch_all_products():
+def fetch_all_products(cache_file="data/api_products.json", cache_ttl=3600):
     """
     Fetches all products from DummyJSON API
+    Reuses a cached copy from cache_file if it is younger than cache_ttl seconds
     """
+    if cache_file and os.path.exists(cache_file):
+        cache_age = time.time() - os.path.getmtime(cache_file)
+        if cache_age < cache_ttl:
+            try:
+                with open(cache_file, "r", encoding="utf-8") as file:
+                    api_products = json.load(file)
+
+                # An empty cache (e.g. left by an older run) is treated as a miss
+                if api_products:
+                    print(f" Loaded {len(api_products)} products from cache '{cache_file}'")
+                    return api_products
+
+            except (OSError, ValueError):
+                # Unreadable cache, fall back to the API
+                pass
+
     url = "https://dummyjson.com/products"
 
     try:
@@ -27,12 +46,22 @@ def fetch_all_products():
             })
 
         print(f" Successfully fetched {len(api_products)} products from API")
-        return api_products
 
     except requests.exceptions.RequestException as e:
         print(f" Failed to fetch products from API: {e}")
         return []
 
+    # An empty product list is not cached, so the next run asks the API again
+    if cache_file and api_products:
+        try:
+            os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as file:
+                json.dump(api_products, file)
+        except OSError as e:
+            print(f" Could not write product cache '{cache_file}': {e}")
+
+    return api_products
+
 
 def create_product_mapping(api_products):
     """
@@ -53,39 +82,52 @@ def create_product_mapping(api_products):
     return product_mapping
 
 
-def enrich_sales_data(transactions, product_mapping):
+def _lookup_api_fields(product_id_str, product_mapping):
     """
-    Enriches transaction data with API product information
+    Resolves the API enrichment fields for a single ProductID
     """
-    enriched_transactions = []
+    api_fields = {
+        "API_Category": None,
+        "API_Brand": None,
+        "API_Rating": None,
+        "API_Match": False,
+    }
 
-    for tx in transactions:
-        enriched_tx = tx.copy()
+    # Keep defaults for IDs without a parseable number
+    if not isinstance(product_id_str, str):
+        return api_fields
 
-        # Default enrichment values
-        enriched_tx["API_Category"] = None
-        enriched_tx["API_Brand"] = None
-        enriched_tx["API_Rating"] = None
-        enriched_tx["API_Match"] = False
+    # Extract numeric product ID (P101 -> 101)
+    # Superscripts and other non-decimal digits leave the ID unmatched
+    digits = "".join(filter(str.isdigit, product_id_str))
+    if not digits.isdecimal():
+        return api_fields
 
-        try:
-            # Extract numeric product ID (P101 -> 101)
-            product_id_str = tx.get("ProductID", "")
-            numeric_id = int("".join(filter(str.isdigit, product_id_str)))
+    api_product = product_mapping.get(int(digits))
+    if api_product is not None:
+        api_fields["API_Category"] = api_product.get("category")
+        api_fields["API_Brand"] = api_product.get("brand")
+        api_fields["API_Rating"] = api_product.get("rating")
+        api_fields["API_Match"] = True
 
-            if numeric_id in product_mapping:
-                api_product = product_mapping[numeric_id]
+    return api_fields
 
-                enriched_tx["API_Category"] = api_product.get("category")
-                enriched_tx["API_Brand"] = api_product.get("brand")
-                enriched_tx["API_Rating"] = api_product.get("rating")
-                enriched_tx["API_Match"] = True
 
-        except Exception:
-            # Keep defaults if anything fails
-            pass
-
-        enriched_transactions.append(enriched_tx)
+def enrich_sales_data(transactions, product_mapping):
+    """
+    Enriches transaction data with API product information
+    """
+    # ProductIDs repeat across transactions, so resolve each distinct ID once
+    api_fields_by_id = {
+        product_id_str: _lookup_api_fields(product_id_str, product_mapping)
+        for product_id_str in {tx.get("ProductID", "") for tx in transactions}
+    }
+
+    # Build each enriched record in one dict display instead of copy + 4 writes
+    enriched_transactions = [
+        {**tx, **api_fields_by_id[tx.get("ProductID", "")]}
+        for tx in transactions
+    ]
 
     # Save to file
     save_enriched_data(enriched_transactions)
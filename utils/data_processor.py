@@ -1,39 +1,119 @@
+import heapq
 from collections import defaultdict
 from datetime import datetime
 
 
-def calculate_total_revenue(transactions):
+def aggregate_all(transactions):
     """
-    Calculates total revenue from all transactions
+    Aggregates transactions by product, region, date and customer in one pass
+    Returns dict of per-group totals shared by the analytics functions
     """
     total_revenue = 0.0
 
+    # Flat per-metric accumulators keep the per-row updates on plain
+    # defaultdict(int/float/set) buckets instead of nested dict lookups
+    product_qty = defaultdict(int)
+    product_revenue = defaultdict(float)
+    region_sales = defaultdict(float)
+    region_count = defaultdict(int)
+    daily_revenue = defaultdict(float)
+    daily_count = defaultdict(int)
+    daily_customers = defaultdict(set)
+    customer_spent = defaultdict(float)
+    customer_count = defaultdict(int)
+    customer_products = defaultdict(set)
+
+    for tx in transactions:
+        qty = tx["Quantity"]
+        # Prefer the amount cached at validation time
+        revenue = tx.get("Revenue")
+        if revenue is None:
+            revenue = qty * tx["UnitPrice"]
+        product_name = tx["ProductName"]
+        customer_id = tx["CustomerID"]
+        region = tx["Region"]
+        date = tx["Date"]
+        total_revenue += revenue
+
+        product_qty[product_name] += qty
+        product_revenue[product_name] += revenue
+
+        region_sales[region] += revenue
+        region_count[region] += 1
+
+        daily_revenue[date] += revenue
+        daily_count[date] += 1
+        daily_customers[date].add(customer_id)
+
+        customer_spent[customer_id] += revenue
+        customer_count[customer_id] += 1
+        customer_products[customer_id].add(product_name)
+
+    # Combine the flat accumulators into per-group records
+    return {
+        "total_revenue": total_revenue,
+        "product": {
+            p: {"quantity": product_qty[p], "revenue": product_revenue[p]}
+            for p in product_qty
+        },
+        "region": {
+            r: {"total_sales": region_sales[r], "transaction_count": region_count[r]}
+            for r in region_sales
+        },
+        "daily": {
+            d: {
+                "revenue": daily_revenue[d],
+                "transaction_count": daily_count[d],
+                "unique_customers": daily_customers[d],
+            }
+            for d in daily_revenue
+        },
+        "customer": {
+            c: {
+                "total_spent": customer_spent[c],
+                "purchase_count": customer_count[c],
+                "products_bought": customer_products[c],
+            }
+            for c in customer_spent
+        },
+    }
+
+
+def calculate_total_revenue(transactions, aggregates=None):
+    """
+    Calculates total revenue from all transactions
+    """
+    if aggregates is not None:
+        return round(aggregates["total_revenue"], 2)
+
+    # Single pass, so one-shot iterables such as iter_clean_sales_data()
+    # work too; prefer the amount cached at validation time
+    total_revenue = 0.0
     for tx in transactions:
-        total_revenue += tx["Quantity"] * tx["UnitPrice"]
+        revenue = tx.get("Revenue")
+        if revenue is None:
+            revenue = tx["Quantity"] * tx["UnitPrice"]
+        total_revenue += revenue
 
     return round(total_revenue, 2)
 
 
-def region_wise_sales(transactions):
+def region_wise_sales(transactions, aggregates=None):
     """
     Analyzes sales by region
     """
-    region_data = defaultdict(lambda: {"total_sales": 0.0, "transaction_count": 0})
-    grand_total = 0.0
+    if aggregates is None:
+        aggregates = aggregate_all(transactions)
 
-    for tx in transactions:
-        revenue = tx["Quantity"] * tx["UnitPrice"]
-        region = tx["Region"]
-
-        region_data[region]["total_sales"] += revenue
-        region_data[region]["transaction_count"] += 1
-        grand_total += revenue
+    grand_total = aggregates["total_revenue"]
 
     # Calculate percentage contribution
-    for region in region_data:
-        region_data[region]["percentage"] = round(
-            (region_data[region]["total_sales"] / grand_total) * 100, 2
-        )
+    region_data = {}
+    for region, data in aggregates["region"].items():
+        region_data[region] = {
+            **data,
+            "percentage": round((data["total_sales"] / grand_total) * 100, 2),
+        }
 
     # Sort by total_sales descending
     sorted_regions = dict(
@@ -47,29 +127,22 @@ def region_wise_sales(transactions):
     return sorted_regions
 
 
-def top_selling_products(transactions, n=5):
+def top_selling_products(transactions, n=5, aggregates=None):
     """
     Finds top n products by total quantity sold
     """
-    product_data = defaultdict(lambda: {"quantity": 0, "revenue": 0.0})
+    if aggregates is None:
+        aggregates = aggregate_all(transactions)
 
-    for tx in transactions:
-        product = tx["ProductName"]
-        qty = tx["Quantity"]
-        revenue = qty * tx["UnitPrice"]
-
-        product_data[product]["quantity"] += qty
-        product_data[product]["revenue"] += revenue
-
-    # Sort by quantity sold descending
-    sorted_products = sorted(
-        product_data.items(),
+    # Select top n by quantity sold without sorting every product
+    top_products = heapq.nlargest(
+        n,
+        aggregates["product"].items(),
         key=lambda x: x[1]["quantity"],
-        reverse=True,
     )
 
     result = []
-    for product, data in sorted_products[:n]:
+    for product, data in top_products:
         result.append(
             (product, data["quantity"], round(data["revenue"], 2))
         )
@@ -77,69 +150,43 @@ def top_selling_products(transactions, n=5):
     return result
 
 
-def customer_analysis(transactions):
+def customer_analysis(transactions, aggregates=None):
     """
     Analyzes customer purchase patterns
     """
-    customer_data = defaultdict(
-        lambda: {
-            "total_spent": 0.0,
-            "purchase_count": 0,
-            "products_bought": set(),
-        }
+    if aggregates is None:
+        aggregates = aggregate_all(transactions)
+
+    # Sort by total_spent descending before formatting, so the result is
+    # built once in order rather than formatted and then re-sorted
+    ranked_customers = sorted(
+        aggregates["customer"].items(),
+        key=lambda x: round(x[1]["total_spent"], 2),
+        reverse=True,
     )
 
-    for tx in transactions:
-        customer = tx["CustomerID"]
-        revenue = tx["Quantity"] * tx["UnitPrice"]
-
-        customer_data[customer]["total_spent"] += revenue
-        customer_data[customer]["purchase_count"] += 1
-        customer_data[customer]["products_bought"].add(tx["ProductName"])
-
-    # Final formatting
-    final_data = {}
-    for customer, data in customer_data.items():
+    sorted_customers = {}
+    for customer, data in ranked_customers:
         avg_order_value = data["total_spent"] / data["purchase_count"]
 
-        final_data[customer] = {
+        sorted_customers[customer] = {
             "total_spent": round(data["total_spent"], 2),
             "purchase_count": data["purchase_count"],
             "avg_order_value": round(avg_order_value, 2),
-            "products_bought": sorted(list(data["products_bought"])),
+            "products_bought": sorted(data["products_bought"]),
         }
 
-    # Sort by total_spent descending
-    sorted_customers = dict(
-        sorted(
-            final_data.items(),
-            key=lambda x: x[1]["total_spent"],
-            reverse=True,
-        )
-    )
-
     return sorted_customers
 
 
-def daily_sales_trend(transactions):
+def daily_sales_trend(transactions, aggregates=None):
     """
     Analyzes sales trends by date
     """
-    daily_data = defaultdict(
-        lambda: {
-            "revenue": 0.0,
-            "transaction_count": 0,
-            "unique_customers": set(),
-        }
-    )
+    if aggregates is None:
+        aggregates = aggregate_all(transactions)
 
-    for tx in transactions:
-        date = tx["Date"]
-        revenue = tx["Quantity"] * tx["UnitPrice"]
-
-        daily_data[date]["revenue"] += revenue
-        daily_data[date]["transaction_count"] += 1
-        daily_data[date]["unique_customers"].add(tx["CustomerID"])
+    daily_data = aggregates["daily"]
 
     # Final formatting and sorting by date
     final_data = {}
@@ -153,48 +200,35 @@ def daily_sales_trend(transactions):
     return final_data
 
 
-def find_peak_sales_day(transactions):
+def find_peak_sales_day(transactions, aggregates=None):
     """
     Identifies the date with highest revenue
     """
-    daily_revenue = defaultdict(lambda: {"revenue": 0.0, "count": 0})
-
-    for tx in transactions:
-        date = tx["Date"]
-        revenue = tx["Quantity"] * tx["UnitPrice"]
-
-        daily_revenue[date]["revenue"] += revenue
-        daily_revenue[date]["count"] += 1
+    if aggregates is None:
+        aggregates = aggregate_all(transactions)
 
     peak_day = max(
-        daily_revenue.items(),
+        aggregates["daily"].items(),
         key=lambda x: x[1]["revenue"]
     )
 
     return (
         peak_day[0],
         round(peak_day[1]["revenue"], 2),
-        peak_day[1]["count"],
+        peak_day[1]["transaction_count"],
     )
 
 
-def low_performing_products(transactions, threshold=10):
+def low_performing_products(transactions, threshold=10, aggregates=None):
     """
     Identifies products with low sales
     """
-    product_data = defaultdict(lambda: {"quantity": 0, "revenue": 0.0})
-
-    for tx in transactions:
-        product = tx["ProductName"]
-        qty = tx["Quantity"]
-        revenue = qty * tx["UnitPrice"]
-
-        product_data[product]["quantity"] += qty
-        product_data[product]["revenue"] += revenue
+    if aggregates is None:
+        aggregates = aggregate_all(transactions)
 
     low_products = []
 
-    for product, data in product_data.items():
+    for product, data in aggregates["product"].items():
         if data["quantity"] < threshold:
             low_products.append(
                 (product, data["quantity"], round(data["revenue"], 2))
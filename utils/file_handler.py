@@ -1,90 +1,177 @@
+import sys
 from collections import defaultdict
 
+# Encodings tried, in order, when decoding the sales file
+SALES_ENCODINGS = ("utf-8", "latin-1", "cp1252")
+
+# Expected first characters of TransactionID, ProductID and CustomerID
+ID_PREFIXES = ("T", "P", "C")
+
 
 def read_sales_data(filename):
     """
     Reads sales data from file handling encoding issues
     Returns list of raw lines (strings)
     """
-    encodings = ["utf-8", "latin-1", "cp1252"]
+    encodings = SALES_ENCODINGS
+
+    # Read the raw bytes once; encoding fallbacks decode this buffer
+    # instead of reopening and re-reading the file
+    try:
+        with open(filename, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return []
 
     for enc in encodings:
         try:
-            with open(filename, "r", encoding=enc) as file:
-                lines = file.readlines()
-                break
+            text = data.decode(enc)
+            break
         except UnicodeDecodeError:
             continue
-        except FileNotFoundError:
-            print(f"Error: File '{filename}' not found.")
-            return []
     else:
         print("Error: Unable to read file with supported encodings.")
         return []
 
+    # Normalize \r\n and \r line endings as text mode would
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+
     # Skip header and remove empty lines
-    raw_lines = []
-    for line in lines[1:]:
-        line = line.strip()
-        if line:
-            raw_lines.append(line)
+    return [line for line in map(str.strip, lines[1:]) if line]
+
+
+def _detect_sales_encoding(filename):
+    """
+    Returns the first supported encoding that decodes the whole file,
+    or None if none does
+    """
+    for enc in SALES_ENCODINGS:
+        try:
+            # Decode in fixed-size chunks so the file is never held in memory
+            with open(filename, "r", encoding=enc) as file:
+                while file.read(1 << 20):
+                    pass
+            return enc
+        except UnicodeDecodeError:
+            continue
+
+    return None
 
-    return raw_lines
 
+def iter_sales_data(filename, stats=None):
+    """
+    Streams sales data lines from file without loading it into memory
+    Yields stripped non-empty lines after the header, decoded with the
+    first supported encoding that accepts the whole file
+    Choosing that encoding costs a full decode pass before streaming, plus
+    one more pass per rejected encoding; read_sales_data() reads the file
+    only once when holding all lines in memory is acceptable
+    Line count is kept in stats (line_count) once the stream is exhausted
+    """
+    if stats is None:
+        stats = {}
+    stats["line_count"] = 0
+
+    try:
+        encoding = _detect_sales_encoding(filename)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return
+
+    if encoding is None:
+        print("Error: Unable to read file with supported encodings.")
+        return
+
+    line_count = 0
+    try:
+        with open(filename, "r", encoding=encoding) as file:
+            # Skip header
+            next(file, None)
+
+            for line in file:
+                line = line.strip()
+                if line:
+                    line_count += 1
+                    yield line
+    finally:
+        stats["line_count"] = line_count
 
-def parse_transactions(raw_lines):
+
+def parse_transactions(raw_lines, stats=None):
     """
     Parses raw lines into clean list of dictionaries
+    Accepts any iterable of lines, including iter_sales_data()
+    If stats is given, regions seen and the amount range are kept in it
+    (regions, amount_min, amount_max) so callers need no extra pass
     """
     transactions = []
-    headers = [
-        "TransactionID",
-        "Date",
-        "ProductID",
-        "ProductName",
-        "Quantity",
-        "UnitPrice",
-        "CustomerID",
-        "Region",
-    ]
+
+    collect_stats = stats is not None
+    regions = set()
+    amount_min = None
+    amount_max = None
 
     for line in raw_lines:
         parts = line.split("|")
 
-        # Skip rows with incorrect number of fields
-        if len(parts) != len(headers):
+        # Skip rows with incorrect number of fields (the eight columns
+        # named in the record below)
+        if len(parts) != 8:
             continue
 
         try:
-            transaction = {}
-
-            transaction["TransactionID"] = parts[0].strip()
-            transaction["Date"] = parts[1].strip()
-            transaction["ProductID"] = parts[2].strip()
-
-            # Remove commas inside ProductName
-            transaction["ProductName"] = parts[3].replace(",", "").strip()
-
-            # Convert Quantity
-            transaction["Quantity"] = int(parts[4].replace(",", "").strip())
+            # Convert Quantity and UnitPrice first so malformed rows are
+            # skipped before a record is built (int/float ignore whitespace)
+            quantity = int(parts[4].replace(",", ""))
+            unit_price = float(parts[5].replace(",", ""))
+        except ValueError:
+            continue
 
-            # Convert UnitPrice
-            transaction["UnitPrice"] = float(parts[5].replace(",", "").strip())
+        region = sys.intern(parts[7].strip())
 
-            transaction["CustomerID"] = parts[6].strip()
-            transaction["Region"] = parts[7].strip()
+        if collect_stats:
+            regions.add(region)
 
-            transactions.append(transaction)
+            amount = quantity * unit_price
+            if amount_min is None or amount < amount_min:
+                amount_min = amount
+            if amount_max is None or amount > amount_max:
+                amount_max = amount
 
-        except (ValueError, IndexError):
-            continue
+        # Build the record in a single dict display
+        transactions.append({
+            "TransactionID": parts[0].strip(),
+            "Date": parts[1].strip(),
+            "ProductID": sys.intern(parts[2].strip()),
+            # Remove commas inside ProductName
+            "ProductName": parts[3].replace(",", "").strip(),
+            "Quantity": quantity,
+            "UnitPrice": unit_price,
+            # Interned: one shared object per distinct ID or region
+            "CustomerID": sys.intern(parts[6].strip()),
+            "Region": region,
+        })
+
+    if collect_stats:
+        stats["regions"] = regions
+        stats["amount_min"] = amount_min
+        stats["amount_max"] = amount_max
 
     return transactions
 
 
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, parse_stats=None, verbose=True):
     """
     Validates transactions and applies optional filters
+    Pass the stats filled by parse_transactions() as parse_stats to reuse
+    its regions and amount range instead of collecting them per row; that
+    range covers every parsed row, so unlike the per-row one it also
+    includes zero-quantity or zero-price amounts
+    With verbose=False nothing is printed and the available regions and
+    amount range are not collected; the returned summary has the counts
     """
     valid_transactions = []
     invalid_count = 0
@@ -97,67 +184,96 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
         "final_count": 0,
     }
 
-    # Show available regions
-    regions = sorted({tx["Region"] for tx in transactions if tx.get("Region")})
-    print(f"Available Regions: {regions}")
-
-    # Show transaction amount range
-    amounts = [
-        tx["Quantity"] * tx["UnitPrice"]
-        for tx in transactions
-        if tx.get("Quantity") and tx.get("UnitPrice")
-    ]
-    if amounts:
-        print(f"Transaction Amount Range: {min(amounts)} - {max(amounts)}")
-
-    for tx in transactions:
-        try:
-            # ---------------- VALIDATION ----------------
-            if tx["Quantity"] <= 0:
-                invalid_count += 1
-                continue
+    # Intern the filter value like parsed regions so the per-row
+    # comparison hits the identity fast path
+    if isinstance(region, str):
+        region = sys.intern(region)
 
-            if tx["UnitPrice"] <= 0:
-                invalid_count += 1
-                continue
+    # Available regions and amount range are gathered in the main loop
+    # rather than with separate passes over the transactions, unless
+    # parse_transactions() already collected them
+    collect_diagnostics = verbose and parse_stats is None
+    regions_seen = set()
+    amount_min = None
+    amount_max = None
 
-            if not tx["TransactionID"].startswith("T"):
-                invalid_count += 1
-                continue
+    filtered_by_region = 0
+    filtered_by_amount = 0
 
-            if not tx["ProductID"].startswith("P"):
-                invalid_count += 1
-                continue
+    # Skip the per-row filter checks entirely when no filter is set
+    filters_enabled = bool(region) or min_amount is not None or max_amount is not None
 
-            if not tx["CustomerID"].startswith("C"):
-                invalid_count += 1
-                continue
+    tid_prefix, pid_prefix, cid_prefix = ID_PREFIXES
 
-            # ---------------- FILTERS ----------------
-            amount = tx["Quantity"] * tx["UnitPrice"]
+    for tx in transactions:
+        if collect_diagnostics:
+            tx_region = tx.get("Region")
+            if tx_region:
+                regions_seen.add(tx_region)
 
-            if region and tx["Region"] != region:
-                summary["filtered_by_region"] += 1
-                continue
+        try:
+            quantity = tx["Quantity"]
+            unit_price = tx["UnitPrice"]
+            amount = quantity * unit_price
 
-            if min_amount is not None and amount < min_amount:
-                summary["filtered_by_amount"] += 1
-                continue
+            if collect_diagnostics and quantity and unit_price:
+                if amount_min is None or amount < amount_min:
+                    amount_min = amount
+                if amount_max is None or amount > amount_max:
+                    amount_max = amount
 
-            if max_amount is not None and amount > max_amount:
-                summary["filtered_by_amount"] += 1
+            # ---------------- VALIDATION ----------------
+            # All validity rules as one short-circuiting predicate
+            if (
+                quantity <= 0
+                or unit_price <= 0
+                or tx["TransactionID"][:1] != tid_prefix
+                or tx["ProductID"][:1] != pid_prefix
+                or tx["CustomerID"][:1] != cid_prefix
+            ):
+                invalid_count += 1
                 continue
 
+            # ---------------- FILTERS ----------------
+            if filters_enabled:
+                if region and tx["Region"] != region:
+                    filtered_by_region += 1
+                    continue
+
+                if (min_amount is not None and amount < min_amount) or (
+                    max_amount is not None and amount > max_amount
+                ):
+                    filtered_by_amount += 1
+                    continue
+
+            # Cache the line amount so downstream aggregations reuse it
+            tx["Revenue"] = amount
             valid_transactions.append(tx)
 
         except KeyError:
             invalid_count += 1
 
     summary["invalid"] = invalid_count
+    summary["filtered_by_region"] = filtered_by_region
+    summary["filtered_by_amount"] = filtered_by_amount
     summary["final_count"] = len(valid_transactions)
 
-    print(f"Records after validation: {summary['total_input'] - invalid_count}")
-    print(f"Records after region filter: {summary['total_input'] - invalid_count - summary['filtered_by_region']}")
-    print(f"Final valid records: {summary['final_count']}")
+    if verbose:
+        if parse_stats is not None:
+            # The parse-time range also counts zero amounts
+            regions_seen = {r for r in parse_stats["regions"] if r}
+            amount_min = parse_stats["amount_min"]
+            amount_max = parse_stats["amount_max"]
+
+        # Show available regions
+        print(f"Available Regions: {sorted(regions_seen)}")
+
+        # Show transaction amount range
+        if amount_min is not None:
+            print(f"Transaction Amount Range: {amount_min} - {amount_max}")
+
+        print(f"Records after validation: {summary['total_input'] - invalid_count}")
+        print(f"Records after region filter: {summary['total_input'] - invalid_count - summary['filtered_by_region']}")
+        print(f"Final valid records: {summary['final_count']}")
 
     return valid_transactions, invalid_count, summary